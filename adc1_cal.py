@@ -57,6 +57,18 @@
 #
 # Please refer to the section "Minimizing Noise" in [1].
 #
+# Native code:
+# The calibration functions (calculate_voltage_linear*(), calculate_voltage_lut(),
+# interpolate_two_points()) use integer arithmetic only and are suitable for
+# @micropython.native / @micropython.viper. The sample accumulation loop in
+# _acquire_sum() only uses locals and is suitable for @micropython.native.
+# The decorators are not applied here, because the module is distributed as
+# architecture independent bytecode (see manifest.py) and mpy-cross rejects
+# native code without -march=<arch>.
+# If the module is cross-compiled for a specific port (e.g. -march=xtensawin),
+# the decorators can be added to these functions; all other ports simply use
+# the bytecode interpreter.
+#
 # The calibration algorithm and constants are based on [2].
 #
 # [1] https://docs.espressif.com/projects/esp-idf/en/latest/esp32/api-reference/peripherals/adc.html#adc-calibration
@@ -83,14 +95,23 @@
 #          Added support of 0/2.5/6 dB attenuation
 # 20211206 Merged pull request by codemee: added support for ATTN_11DB
 # 20230204 Improved coding style
+# 20261014 Integer (fixed-point) linear conversion as in [2]
+#          Integer LUT interpolation for ADC.ATTN_11DB
+#          Added samples(); linear calibration is applied to the sum of samples
+#          Removed decode_bits(); efuse V_ref is decoded in read_efuse_vref()
+#          Added optional conversion table
+#          __str__() shows raw value and voltage from the same ADC samples
+#          Added optional exponential moving average
+#          Oversampling: 4^n samples provide up to n extra bits of resolution
 #
 # ToDo:
 # - add support of "Two Point Calibration"
 #
 ###############################################################################
 
+from array import array
 import machine
-from machine import ADC
+from machine import ADC, mem32
 
 # fmt: off
 # Constant from
@@ -100,7 +121,7 @@ _DR_REG_EFUSE_BASE      = const(0x3FF5A000)
 # Constants from
 # https://github.com/espressif/esp-idf/blob/master/components/soc/esp32/include/soc/efuse_reg.h
 _EFUSE_ADC_VREF         = const(0x0000001F)
-_EFUSE_BLK0_RDATA4_REG  = _DR_REG_EFUSE_BASE + 0x010
+_EFUSE_BLK0_RDATA4_REG  = const(_DR_REG_EFUSE_BASE + 0x010)
 
 # Constants from
 # esp_adc_cal_esp32.c
@@ -108,69 +129,121 @@ _ADC_12_BIT_RES         = const(4096)
 _LIN_COEFF_A_SCALE      = const(65536)
 # LIN_COEFF_A_SCALE/2
 _LIN_COEFF_A_ROUND      = const(32768)
-_ADC1_VREF_ATTEN_SCALE  = [57431, 76236, 105481, 196602]
-_ADC1_VREF_ATTEN_OFFSET = [75, 78, 107, 142]
-_VREF_REG               = _EFUSE_BLK0_RDATA4_REG
+# Minimum of coefficient 'a' applied to the sum of raw ADC readings (12 significant bits)
+_COEFF_A_SUM_MIN        = const(4096)
+_ADC1_VREF_ATTEN_SCALE  = (57431, 76236, 105481, 196602)
+_ADC1_VREF_ATTEN_OFFSET = (75, 78, 107, 142)
+_VREF_REG               = const(_EFUSE_BLK0_RDATA4_REG)
 _VREF_OFFSET            = const(1100)
 _VREF_STEP_SIZE         = const(7)
+# Sign-magnitude
 _VREF_FORMAT            = const(0)
 _VREF_MASK              = const(0x1F)
+# Sign bit position / magnitude bits of sign-magnitude value
+_VREF_SIGN_BIT          = const(4)
+_VREF_MAGNITUDE         = const(0x0F)
 _LUT_VREF_LOW           = const(1000)
 _LUT_VREF_HIGH          = const(1200)
 _LUT_ADC_STEP_SIZE      = const(64)
+# log2(_LUT_ADC_STEP_SIZE)
+_LUT_ADC_STEP_SHIFT     = const(6)
 _LUT_POINTS             = const(20)
 _LUT_LOW_THRESH         = const(2880)
-_LUT_HIGH_THRESH        = _LUT_LOW_THRESH + _LUT_ADC_STEP_SIZE
+_LUT_HIGH_THRESH        = const(_LUT_LOW_THRESH + _LUT_ADC_STEP_SIZE)
+# (_LUT_VREF_HIGH - _LUT_VREF_LOW) * _LUT_ADC_STEP_SIZE
+_LUT_DENOM              = const(12800)
+
+# Attenuation names for __str__()
+_ATTEN_NAMES            = ("0dB", "2.5dB", "6dB", "11dB")
 # fmt: on
 
 # 20 Point lookup tables, covering ADC readings from 2880 to 4096, step size of 64
+# (stored as unsigned 16-bit arrays to save RAM)
 # LUT for VREF 1000mV
-_lut_adc1_low = [
-    2240,
-    2297,
-    2352,
-    2405,
-    2457,
-    2512,
-    2564,
-    2616,
-    2664,
-    2709,
-    2754,
-    2795,
-    2832,
-    2868,
-    2903,
-    2937,
-    2969,
-    3000,
-    3030,
-    3060,
-]
+_lut_adc1_low = array(
+    "H",
+    [
+        2240,
+        2297,
+        2352,
+        2405,
+        2457,
+        2512,
+        2564,
+        2616,
+        2664,
+        2709,
+        2754,
+        2795,
+        2832,
+        2868,
+        2903,
+        2937,
+        2969,
+        3000,
+        3030,
+        3060,
+    ],
+)
 
 # LUT for VREF 1200mV
-_lut_adc1_high = [
-    2667,
-    2706,
-    2745,
-    2780,
-    2813,
-    2844,
-    2873,
-    2901,
-    2928,
-    2956,
-    2982,
-    3006,
-    3032,
-    3059,
-    3084,
-    3110,
-    3135,
-    3160,
-    3184,
-    3209,
-]
+_lut_adc1_high = array(
+    "H",
+    [
+        2667,
+        2706,
+        2745,
+        2780,
+        2813,
+        2844,
+        2873,
+        2901,
+        2928,
+        2956,
+        2982,
+        3006,
+        3032,
+        3059,
+        3084,
+        3110,
+        3135,
+        3160,
+        3184,
+        3209,
+    ],
+)
+
+# V_ref calibration value from efuse [mV] (read once, see _read_vref_once())
+_vref_cache = None
+
+
+def _read_vref_once():
+    # Read V_ref calibration value from efuse - shared by all ADC1Cal instances
+    global _vref_cache
+
+    # The efuse value is constant - only read the hardware register once
+    if _vref_cache is not None:
+        return _vref_cache
+
+    # eFuse stores deviation from ideal reference voltage
+    # Ideal vref
+    ret = _VREF_OFFSET
+
+    # GET_REG_FIELD():
+    # https://github.com/espressif/esp-idf/blob/master/components/soc/esp32/include/soc/soc.h
+    # Bit positions:
+    # https://github.com/espressif/esp-idf/blob/master/components/soc/esp32/include/soc/efuse_reg.h
+    # EFUSE_RD_ADC_VREF : R/W ;bitpos:[12:8] ;default: 5'b0
+    bits = (mem32[_VREF_REG] >> 8) & _VREF_MASK
+
+    # Decode sign-magnitude value (_VREF_FORMAT == 0) without branching:
+    # bit 4 - sign (-> factor -1 or +1), bits 3..0 - magnitude
+    sign = -(bits >> _VREF_SIGN_BIT) | 1
+    ret += sign * (bits & _VREF_MAGNITUDE) * _VREF_STEP_SIZE
+
+    # ADC Vref in mV
+    _vref_cache = ret
+    return ret
 
 
 #################################################################################
@@ -187,11 +260,30 @@ class ADC1Cal(machine.ADC):
         _width (int):       encoded width of ADC result (0...3)
         _samples (int):     number of ADC samples for averaging
         vref (int):         ADC reference voltage in mV (from efuse calibration data or supplied by programmer)
-        _coeff_a (float):   conversion function coefficient 'a'
-        _coeff_b (float):   conversion function coefficient 'b'
+        _coeff_a (int):     conversion function coefficient 'a' (scaled by _LIN_COEFF_A_SCALE)
+        _coeff_b (int):     conversion function coefficient 'b'
+        _coeff_a_sum (int): coefficient 'a' applied to the sum of _samples raw ADC readings
+        _coeff_b_q16 (int): coefficient 'b' incl. rounding (scaled by _LIN_COEFF_A_SCALE)
+        _coeff_b_q16_mv (int): coefficient 'b' incl. rounding to whole mV (scaled by _LIN_COEFF_A_SCALE)
+        _oversample_bits (int): extra resolution bits gained by oversampling (4^n samples -> n bits,
+                            linear calibration of the sum only, limited by precision of _coeff_a_sum)
+        _div_scaled (float): voltage divider scaled by 2^_oversample_bits
+        _lin_shift (int):   right shift of linear conversion result (16 - _oversample_bits)
+        _width_shift (int): left shift for extending ADC result to 12 bits
+        _calculate_voltage: calibration function for the selected attenuation
+                            (returns voltage [mV] scaled by 2^_oversample_bits)
+        _read:              bound ADC.read() method
+        _acquire:           function returning the sum of _samples ADC readings
+        _samples_shift (int): log2(_samples) if _samples is a power of two, otherwise 0
+        _lut_x1dist (int):  distance of vref from _LUT_VREF_LOW (LUT interpolation)
+        _lut_x2dist (int):  distance of vref from _LUT_VREF_HIGH (LUT interpolation)
+        _use_table (bool):  use conversion table instead of calibration function
+        _table (array):     conversion table raw ADC value -> voltage [mV] (or None)
+        _use_ema (bool):    use exponential moving average instead of averaging _samples readings
+        _ema_sum (int):     exponential moving average (scaled by _samples)
     """
 
-    def __init__(self, pin, div, vref=None, samples=10, name=""):
+    def __init__(self, pin, div, vref=None, samples=10, name="", table=False, ema=False):
         """
         The constructor for Battery class.
 
@@ -201,17 +293,27 @@ class ADC1Cal(machine.ADC):
             vref (int):             reference voltage (optionally supplied by programmer)
             samples (int):          number of ADC samples for averaging
             name (string):          instance name
+            table (bool):           use conversion table (2 bytes per raw ADC value)
+            ema (bool):             use exponential moving average (alpha = 1 / samples)
         """
         super().__init__(pin)
+        # Bound ADC.read() method - avoids method lookup on every acquisition
+        self._read = self.read
         # fmt: off
-        self.name     = name
-        self._div     = div
-        self._width   = 3
-        self._samples = samples
-        self.vref     = self.read_efuse_vref() if (vref is None) else vref
-        self._atten   = None
-        self.atten(ADC.ATTN_6DB)
+        self.name         = name
+        self._div         = div
+        self._width       = 3
+        self._width_shift = 0
+        self.vref         = self.read_efuse_vref() if (vref is None) else vref
+        self._atten       = None
+        self._use_table   = table
+        self._table       = None
+        self._use_ema     = ema
+        self._ema_sum     = 0
         # fmt: on
+        self.samples(samples)
+        super().atten(ADC.ATTN_6DB)
+        self._set_atten_params(ADC.ATTN_6DB)
 
     def atten(self, attenuation):
         """
@@ -219,17 +321,129 @@ class ADC1Cal(machine.ADC):
 
         Parameter identical to ADC.atten()
 
-        Currently ADC.ATTN_11DB is not supported!
-
         Parameters:
             attenuation (int): ADC.ATTN_0DB / ADC.ATTN_2_5DB / ADC.ATTN_6DB /  ADC.ATTN_11DB
         """
+        assert (
+            attenuation >= 0 and attenuation < 4
+        ), "Expecting ADC.ATTN_0DB (0), ADC.ATTN_2_5DB (1), ADC.ATTN_6DB (2), or ADC.ATTN_11DB (3)"
         super().atten(attenuation)
+        self._set_atten_params(attenuation)
+
+    def _set_atten_params(self, attenuation):
+        # Calibration parameters depending on attenuation (no hardware access)
         # fmt: off
-        self._coeff_a = self.vref * _ADC1_VREF_ATTEN_SCALE[attenuation] / _ADC_12_BIT_RES
+        self._coeff_a = (self.vref * _ADC1_VREF_ATTEN_SCALE[attenuation]) // _ADC_12_BIT_RES
         self._coeff_b = _ADC1_VREF_ATTEN_OFFSET[attenuation]
         self._atten   = attenuation
+        # LUT interpolation weights only depend on vref
+        self._lut_x2dist = _LUT_VREF_HIGH - self.vref
+        self._lut_x1dist = self.vref - _LUT_VREF_LOW
         # fmt: on
+        self._set_acquire()
+        # Release conversion table - rebuilt by the next conversion
+        self._table = None
+        self._set_calculate_voltage()
+
+    def samples(self, samples):
+        """
+        Select number of ADC samples for averaging
+
+        Parameters:
+            samples (int): number of ADC samples
+        """
+        assert samples >= 1, "Expecting samples >= 1"
+        self._samples = samples
+        self._set_acquire()
+        # Averaging by shift instead of division if samples is a power of two
+        # (int.bit_length() is not available in MicroPython)
+        shift = 0
+        while (1 << shift) < samples:
+            shift += 1
+        self._samples_shift = shift if (1 << shift) == samples else 0
+        # During construction, this is done by _set_atten_params()
+        if self._atten is not None:
+            self._set_calculate_voltage()
+
+    def _set_acquire(self):
+        # Select acquisition function - (re-)starts exponential moving average
+        if self._samples == 1:
+            # A single sample does not need the accumulation loop
+            self._acquire = self._read
+        elif self._use_ema:
+            self._acquire = self._acquire_ema_start
+        else:
+            self._acquire = self._acquire_sum
+
+    def _acquire_ema_start(self):
+        # Initialize exponential moving average with first ADC reading
+        self._ema_sum = self._read() * self._samples
+        self._acquire = self._acquire_ema
+        return self._ema_sum
+
+    def _acquire_ema(self):
+        # Exponential moving average with alpha = 1 / _samples - kept scaled by
+        # _samples (i.e. like a sum of _samples readings) to retain fractional bits;
+        # only one ADC reading per call
+        ema_sum = self._ema_sum
+        ema_sum += self._read() - (ema_sum + (self._samples >> 1)) // self._samples
+        self._ema_sum = ema_sum
+        return ema_sum
+
+    def _acquire_sum(self):
+        # Bind to local - avoids attribute lookups in the loop
+        read = self._read
+        raw_sum = 0
+
+        # Read and accumulate ADC samples
+        for _ in range(self._samples):
+            raw_sum += read()
+
+        return raw_sum
+
+    def _set_calculate_voltage(self):
+        # Select calibration function once instead of on every conversion -
+        # only the linear calibration of the sum provides extra resolution bits
+        self._oversample_bits = 0
+        if self._use_table:
+            if self._table is None:
+                self._calculate_voltage = self._calculate_voltage_table_init
+            else:
+                self._calculate_voltage = self.calculate_voltage_table
+        elif self._atten == ADC.ATTN_11DB:
+            self._calculate_voltage = self.calculate_voltage_11db_sum
+        else:
+            self._set_linear_sum()
+        self._div_scaled = self._div * (1 << self._oversample_bits)
+
+    def _set_linear_sum(self):
+        # Coefficient 'a' divided by the number of samples and including the
+        # extension to 12 bits (with rounding) - allows applying the calibration
+        # to the sum of raw samples directly
+        scale = self.vref * _ADC1_VREF_ATTEN_SCALE[self._atten]
+        div = (_ADC_12_BIT_RES >> self._width_shift) * self._samples
+        self._coeff_a_sum = (scale + (div >> 1)) // div
+        if self._coeff_a_sum < _COEFF_A_SUM_MIN:
+            # Too few significant bits left - calculate average first
+            self._calculate_voltage = self.calculate_voltage_linear_avg
+            return
+
+        # Rounding error of _coeff_a_sum is below 1 mV (raw_sum < div): _coeff_a_sum >=
+        # _COEFF_A_SUM_MIN implies div <= scale / 4095.5 <= 57605, so the error
+        # |_coeff_a_sum * div - scale| <= div / 2 is always below _LIN_COEFF_A_SCALE
+        # Oversampling: the sum of 4^n samples provides n extra bits of resolution -
+        # limited to keep the rounding error of _coeff_a_sum (< div / 2^17 mV) within
+        # half an LSB of the result
+        bits = 0
+        while (4 << (2 * bits)) <= self._samples and (div << (bits + 1)) <= _LIN_COEFF_A_SCALE:
+            bits += 1
+        self._oversample_bits = bits
+        # Coefficient 'b' and rounding - the result keeps _oversample_bits fractional bits
+        self._coeff_b_q16 = (self._coeff_b << 16) + (_LIN_COEFF_A_ROUND >> self._oversample_bits)
+        self._lin_shift = 16 - self._oversample_bits
+        # Coefficient 'b' and rounding to whole mV - used by voltage_mv
+        self._coeff_b_q16_mv = (self._coeff_b << 16) + _LIN_COEFF_A_ROUND
+        self._calculate_voltage = self.calculate_voltage_linear_sum
 
     def width(self, adc_width):
         """
@@ -245,66 +459,50 @@ class ADC1Cal(machine.ADC):
         ), "Expecting ADC_WIDTH9 (0), ADC_WIDTH10 (1), ADC_WIDTH11 (2), or ADC_WIDTH12 (3)"
         super().width(adc_width)
         self._width = adc_width
+        self._width_shift = 3 - adc_width
+        self._set_acquire()
+        # Release conversion table - rebuilt by the next conversion
+        self._table = None
+        self._set_calculate_voltage()
+
+    def _set_table(self):
+        # Conversion table for all raw ADC values at the selected width -
+        # replaces the calibration function by a single lookup
+        if self._atten == ADC.ATTN_11DB:
+            calculate_voltage = self.calculate_voltage_11db
+        else:
+            calculate_voltage = self.calculate_voltage_linear
+        shift = self._width_shift
+        # Initializer with length but without temporary buffer (entries are overwritten)
+        table = array("H", range(_ADC_12_BIT_RES >> shift))
+        for raw_val in range(len(table)):
+            table[raw_val] = calculate_voltage(raw_val << shift)
+        self._table = table
 
     def read_efuse_vref(self):
         """
         Read V_ref calibration value from efuse (i.e. read SOC hardware register)
 
-        Returns:
-            int: calibrated ADC reference voltage (V_ref) in mV
-        """
-        # eFuse stores deviation from ideal reference voltage
-        # Ideal vref
-        ret = _VREF_OFFSET
-
-        # GET_REG_FIELD():
-        # https://github.com/espressif/esp-idf/blob/master/components/soc/esp32/include/soc/soc.h
-        # Bit positions:
-        # https://github.com/espressif/esp-idf/blob/master/components/soc/esp32/include/soc/efuse_reg.h
-        # EFUSE_RD_ADC_VREF : R/W ;bitpos:[12:8] ;default: 5'b0
-        bits = (machine.mem32[_VREF_REG] >> 8) & _VREF_MASK
-        ret += self.decode_bits(bits, _VREF_MASK, _VREF_FORMAT) * _VREF_STEP_SIZE
-
-        # ADC Vref in mV
-        return ret
-
-    def decode_bits(self, bits, mask, is_twos_compl):
-        """
-        Decode bit value from two's complement or sign-magnitude to integer
-
-        Parameters:
-            bits (int):                bit-field value
-            mask (int):                bit mask
-            is_twos_complement (bool): True - two's complement / False: sign-magnitude
+        The register is only read once; subsequent calls (from any instance)
+        return the cached value.
 
         Returns:
-            int: decoded value
+            int: calibrated ADC reference voltage (V_ref) in mV
         """
-        # Check sign bit (MSB of mask)
-        if bits & ~(mask >> 1) & mask:
-            # Negative
-            if is_twos_compl:
-                # 2's complement
-                ret = -(((~bits) + 1) & (mask >> 1))
-            else:
-                # Sign-magnitude
-                ret = -(bits & (mask >> 1))
-        else:
-            # Positive
-            ret = bits & (mask >> 1)
-
-        return ret
+        return _read_vref_once()
 
     # Only call when ADC reading is above threshold
     def calculate_voltage_lut(self, adc):
         # Get index of lower bound points of LUT
-        i = int((adc - _LUT_LOW_THRESH) / _LUT_ADC_STEP_SIZE)
+        i = (adc - _LUT_LOW_THRESH) >> _LUT_ADC_STEP_SHIFT
+        # Removed at optimization level >= 3 (see manifest.py)
+        assert 0 <= i < _LUT_POINTS - 1, "ADC reading out of LUT range"
 
         # Let the X Axis be self.vref, Y axis be ADC reading, and Z be voltage
         # (x2 - x)
-        x2dist = _LUT_VREF_HIGH - self.vref
+        x2dist = self._lut_x2dist
         # (x - x1)
-        x1dist = self.vref - _LUT_VREF_LOW
+        x1dist = self._lut_x1dist
         # (y2 - y)
         y2dist = ((i + 1) * _LUT_ADC_STEP_SIZE) + _LUT_LOW_THRESH - adc
         # (y - y1)
@@ -328,22 +526,68 @@ class ADC1Cal(machine.ADC):
             + (q12 * x2dist * y1dist)
             + (q22 * x1dist * y1dist)
         )
-        # Integer division rounding
-        # voltage += ((_LUT_VREF_HIGH - _LUT_VREF_LOW) * _LUT_ADC_STEP_SIZE) / 2
-        # Divide by ((x2-x1)*(y2-y1))
-        voltage /= (_LUT_VREF_HIGH - _LUT_VREF_LOW) * _LUT_ADC_STEP_SIZE
-        return voltage
+        # Divide by ((x2-x1)*(y2-y1)) - integer division with rounding
+        return (voltage + (_LUT_DENOM >> 1)) // _LUT_DENOM
 
     def interpolate_two_points(self, y1, y2, x_step, x):
         # Interpolate between two points (x1,y1) (x2,y2) between 'lower' and 'upper' separated by 'step'
-        return ((y1 * x_step) + (y2 * x) - (y1 * x) + (x_step / 2)) / x_step
+        return ((y1 * x_step) + (y2 * x) - (y1 * x) + (x_step >> 1)) // x_step
 
     def calculate_voltage_linear(self, raw_val):
-        # Apply linear correction coefficients
-        voltage = (
-            ((self._coeff_a * raw_val) + _LIN_COEFF_A_ROUND) / _LIN_COEFF_A_SCALE
-        ) + self._coeff_b
-        return voltage
+        # Apply linear correction coefficients (Q16 fixed-point, as in [2])
+        return ((self._coeff_a * raw_val + _LIN_COEFF_A_ROUND) >> 16) + self._coeff_b
+
+    def calculate_voltage_linear_sum(self, raw_sum):
+        # Apply linear correction coefficients to the sum of _samples raw ADC readings
+        # (no rounding to the ADC resolution before scaling - keeps oversampling gain)
+        return (self._coeff_a_sum * raw_sum + self._coeff_b_q16) >> self._lin_shift
+
+    def calculate_voltage_linear_avg(self, raw_sum):
+        # Extend result to 12 bits, calculate average and apply linear correction
+        # - used if _coeff_a_sum would be too imprecise (many samples)
+        raw_val = self._averaged_raw(raw_sum << self._width_shift)
+        return self.calculate_voltage_linear(raw_val)
+
+    def calculate_voltage_11db_sum(self, raw_sum):
+        # Extend result to 12 bits and calculate average - required by LUT
+        raw_val = self._averaged_raw(raw_sum << self._width_shift)
+        return self.calculate_voltage_11db(raw_val)
+
+    def _averaged_raw(self, raw_sum):
+        # Calculate average of sum of _samples ADC readings (integer division with rounding)
+        raw_sum += self._samples >> 1
+        if self._samples_shift:
+            return raw_sum >> self._samples_shift
+        return raw_sum // self._samples
+
+    def _calculate_voltage_table_init(self, raw_sum):
+        # Build conversion table on first use - avoids building it several times
+        # during configuration (constructor, atten(), width())
+        self._set_table()
+        self._calculate_voltage = self.calculate_voltage_table
+        return self.calculate_voltage_table(raw_sum)
+
+    def calculate_voltage_table(self, raw_sum):
+        # Calculate average and look up voltage
+        return self._table[self._averaged_raw(raw_sum)]
+
+    def calculate_voltage_11db(self, raw_val):
+        # Check if in non-linear region
+        if raw_val < _LUT_LOW_THRESH:
+            return self.calculate_voltage_linear(raw_val)
+
+        # Use lookup table to get voltage in non linear portion of ADC_ATTEN_DB_11
+        lut_voltage = self.calculate_voltage_lut(raw_val)
+
+        # If ADC is transitioning from linear region to non-linear region
+        if raw_val <= _LUT_HIGH_THRESH:
+            # Linearly interpolate between linear voltage and lut voltage
+            linear_voltage = self.calculate_voltage_linear(raw_val)
+            return self.interpolate_two_points(
+                linear_voltage, lut_voltage, _LUT_ADC_STEP_SIZE, (raw_val - _LUT_LOW_THRESH)
+            )
+
+        return lut_voltage
 
     @property
     def voltage(self):
@@ -353,53 +597,41 @@ class ADC1Cal(machine.ADC):
         Returns:
             float: voltage [mV]
         """
-        assert self._atten is not None, "Currently ADC.ATTN_11DB is not supported!"
+        # Apply calibration function (to sum of samples) and external input voltage divider
+        return self._calculate_voltage(self._acquire()) / self._div_scaled
 
-        raw_val = 0
-
-        # Read and accumulate ADC samples
-        for _ in range(self._samples):
-            raw_val += self.read()
-
-        # Calculate average
-        raw_val = int(round(raw_val / self._samples))
-
-        # Extend result to 12 bits (required by calibration function)
-        raw_val <<= 3 - self._width
+    @property
+    def voltage_mv(self):
+        """
+        Get voltage measurement [mV] as integer.
 
-        # Check if in non-linear region
-        if self._atten == ADC.ATTN_11DB and raw_val >= _LUT_LOW_THRESH:
-            # Use lookup table to get voltage in non linear portion of ADC_ATTEN_DB_11
-            lut_voltage = self.calculate_voltage_lut(raw_val)
-            # If ADC is transitioning from linear region to non-linear region
-            if raw_val <= _LUT_HIGH_THRESH:
-                # Linearly interpolate between linear voltage and lut voltage
-                linear_voltage = self.calculate_voltage_linear(raw_val)
-                voltage = self.interpolate_two_points(
-                    linear_voltage, lut_voltage, _LUT_ADC_STEP_SIZE, (raw_val - _LUT_LOW_THRESH)
-                )
-            else:
-                voltage = lut_voltage
-        else:
-            # Apply calibration function
-            voltage = self.calculate_voltage_linear(raw_val)
+        Without external voltage divider (div = 1), no float operation is required.
 
-        # Apply external input voltage divider
-        voltage = voltage / self._div
+        Returns:
+            int: voltage [mV]
+        """
+        if self._div == 1:
+            if self._oversample_bits:
+                # Round the sum of samples to whole mV only once (extra resolution bits
+                # are only provided by calculate_voltage_linear_sum())
+                return (self._coeff_a_sum * self._acquire() + self._coeff_b_q16_mv) >> 16
+            return self._calculate_voltage(self._acquire())
 
-        return voltage
+        # Apply calibration function (to sum of samples) and external input voltage divider
+        # (with rounding)
+        return int(self._calculate_voltage(self._acquire()) / self._div_scaled + 0.5)
 
     def __str__(self):
-        _atten = ["0dB", "2.5dB", "6dB", "11dB"]
-        if self.name != "":
-            name_str = "Name: {} ".format(self.name)
-        else:
-            name_str = ""
-
-        raw_val = self.read()
-
-        return "{} width: {:2}, attenuation: {:>5}, raw value: {:4}, value: {}".format(
-            name_str, 9 + self._width, _atten[self._atten], raw_val, self.voltage
+        # Raw value and voltage from the same ADC samples
+        raw_sum = self._acquire()
+        raw_val = self._averaged_raw(raw_sum)
+        voltage = self._calculate_voltage(raw_sum) / self._div_scaled
+        name_prefix = f"Name: {self.name} " if self.name else ""
+
+        return (
+            f"{name_prefix} width: {9 + self._width:2}, "
+            f"attenuation: {_ATTEN_NAMES[self._atten]:>5}, "
+            f"raw value: {raw_val:4}, value: {voltage}"
         )
 
 